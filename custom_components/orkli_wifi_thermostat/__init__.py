@@ -14,6 +14,7 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
 from .coordinator import OrkliCoordinator
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,12 +60,20 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     # Setup platforms (based on the list of entity types in PLATFORMS defined above)
     # This calls the async_setup method in each of your entity type files.
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+
+    # Register the integration services, shared by all config entries.
+    async_setup_services(hass)
+
     # Return true to denote a successful setup.
     return True
 
 
 async def _async_update_listener(hass: HomeAssistant, config_entry):
     """Handle config options update."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id].coordinator
+    if dict(config_entry.options) == coordinator.options:
+        # Only the zone list was updated by the background rediscovery.
+        return
     # Reload the integration when the options change.
     await hass.config_entries.async_reload(config_entry.entry_id)
 
@@ -85,6 +94,7 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     # Remove the config entry from the hass data object.
     if unload_ok:
         hass.data[DOMAIN].pop(config_entry.entry_id)
+        async_unload_services(hass)
 
     # Return that unloading was successful.
     return unload_ok
@@ -15,9 +15,15 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import Device
 from .const import DOMAIN
 from .coordinator import OrkliCoordinator
+from .pyorkli import (
+    Device,
+    raw_to_humidity,
+    raw_to_target_temperature,
+    raw_to_temperature,
+    raw_to_temperature_rate,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,16 +47,28 @@ async def async_setup_entry(
     # Create the sensors.
     async_add_entities(climateDevices)
 
+    @callback
+    def _async_add_new_devices(devices: list[Device]) -> None:
+        """Add the zones found by the background rediscovery."""
+        async_add_entities(ExampleClimate(coordinator, device) for device in devices)
+
+    config_entry.async_on_unload(
+        coordinator.async_add_new_devices_listener(_async_add_new_devices)
+    )
+
 
 class ExampleClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
     """Implementation of a climate entity."""
 
     # _unrecorded_attributes = ["target_temperature_high", "target_temperature_low"]
 
-    @property
-    def supported_features(self) -> int:
-        """Return the list of supported features."""
-        return ClimateEntityFeature.TARGET_TEMPERATURE
+    # Static attributes, the dynamic ones are refreshed by _update_attrs.
+    _attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_min_temp = 15.0
+    _attr_max_temp = 35.0
+    _attr_precision = 0.5
+    _attr_target_temperature_step = 0.5
 
     def __init__(self, coordinator: OrkliCoordinator, device: Device) -> None:
         """Initialise sensor."""
@@ -58,20 +76,97 @@ class ExampleClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
         self.device = device
         self.device_id = device.device_id
 
+        # All entities must have a unique id.  Think carefully what you want this to be as
+        # changing it later will cause HA to create new entities.
+        self._attr_unique_id = f"{DOMAIN}-{device.device_unique_id}"
+        self._attr_device_info = DeviceInfo(
+            name=coordinator.device_display_name(device),
+            manufacturer="Orkli",
+            model="TermoLite",
+            sw_version="1.0",
+            identifiers={coordinator.device_identifier(device)},
+        )
+
+        # Raw register values the dynamic attributes were computed from.
+        self._current_temperature_raw: float | None = None
+        self._target_temperature_raw: float | None = None
+        self._current_humidity_raw: float | None = None
+        self._hvac_mode_raw: tuple[bool, int] | None = None
+        self._trend_raw: tuple[int, float | None, float | None] | None = None
+        self._update_attrs()
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Update sensor with latest data from coordinator."""
         # This method is called by your DataUpdateCoordinator when a successful update runs.
-        self.device = self.coordinator.get_device_by_id(self.device_id)
+        updated_device_ids = self.coordinator.updated_device_ids
+        if updated_device_ids is not None and self.device_id not in updated_device_ids:
+            # Pushed packet for another zone, nothing changed here.
+            return
+        device = self.coordinator.get_device_by_id(self.device_id)
+        if device is None:
+            # Zone removed from the controller, the entity is being removed.
+            return
+        self.device = device
+        self._update_attrs()
         self.async_write_ha_state()
 
-    @property
-    def hvac_modes(self) -> list[HVACMode]:
-        """Return the list of available hvac operation modes."""
-        return [HVACMode.OFF, HVACMode.COOL, HVACMode.HEAT]
-
-    @property
-    def hvac_mode(self) -> HVACMode:
+    def _update_attrs(self) -> None:
+        """Recompute the attributes whose source register changed."""
+        device = self.device
+        self._attr_name = device.name
+        if device.current_temperature != self._current_temperature_raw:
+            self._current_temperature_raw = device.current_temperature
+            self._attr_current_temperature = raw_to_temperature(
+                device.current_temperature
+            )
+        if device.target_temperature != self._target_temperature_raw:
+            self._target_temperature_raw = device.target_temperature
+            self._attr_target_temperature = raw_to_target_temperature(
+                device.target_temperature
+            )
+        if device.current_humidity != self._current_humidity_raw:
+            self._current_humidity_raw = device.current_humidity
+            self._attr_current_humidity = raw_to_humidity(device.current_humidity)
+        if (device.on, device.mode) != self._hvac_mode_raw:
+            self._hvac_mode_raw = (device.on, device.mode)
+            self._attr_hvac_mode = self._get_hvac_mode()
+            # The mode register cannot be written, a zero write is a read and
+            # heating is mode 0. Only the mode the controller is in is offered.
+            self._attr_hvac_modes = [
+                HVACMode.OFF,
+                HVACMode.COOL if device.mode == 1 else HVACMode.HEAT,
+            ]
+        trend = self.coordinator.installation.trends.get(self.device_id)
+        trend_raw = (
+            trend.version if trend is not None else 0,
+            device.current_temperature,
+            device.target_temperature,
+        )
+        if trend_raw != self._trend_raw:
+            self._trend_raw = trend_raw
+            warming_rate = raw_to_temperature_rate(
+                trend.slope() if trend is not None else None
+            )
+            self._attr_extra_state_attributes = {
+                "extra_info": "Extra Info",
+                "warming_rate": round(warming_rate, 2)
+                if warming_rate is not None
+                else None,
+                "time_to_target": self._get_time_to_target(warming_rate),
+            }
+
+    def _get_time_to_target(self, warming_rate: float | None) -> int | None:
+        """Return the minutes to reach the target temperature at the current rate."""
+        current = self._attr_current_temperature
+        target = self._attr_target_temperature
+        if current is None or target is None or not warming_rate:
+            return None
+        hours = (target - current) / warming_rate
+        # Moving away from the target, it will not be reached.
+        return round(hours * 60) if hours >= 0 else None
+
+    def _get_hvac_mode(self) -> HVACMode | None:
         """Return the current operation mode."""
         if not self.device.on:
             return HVACMode.OFF
@@ -80,79 +175,7 @@ class ExampleClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
                 return HVACMode.HEAT
             case 1:
                 return HVACMode.COOL
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
-        return DeviceInfo(
-            name=f"Thermostat {self.device.name}: {self.device.device_id}",
-            manufacturer="Orkli",
-            model="TermoLite",
-            sw_version="1.0",
-            identifiers={
-                (
-                    DOMAIN,
-                    f"{self.coordinator.data.controller_name}-{self.device.device_id}",
-                )
-            },
-        )
-
-    @property
-    def name(self) -> str:
-        """Return the name of the sensor."""
-        return self.device.name
-
-    @property
-    def current_temperature(self) -> float | None:
-        """Return the state of the entity."""
-        return (
-            (162.0 - float(self.device.current_temperature)) / 2.0
-            if self.device.current_temperature is not None
-            else None
-        )
-
-    @property
-    def target_temperature(self) -> float | None:
-        """Return the target temperature."""
-        return (
-            float(self.device.target_temperature) / 2.0
-            if self.device.target_temperature is not None
-            else None
-        )
-
-    @property
-    def current_humidity(self) -> float | None:
-        """Return the state of the entity."""
-        return (
-            int(float(self.device.current_humidity) / 2.55)
-            if self.device.current_humidity is not None
-            else None
-        )
-
-    @property
-    def temperature_unit(self) -> str:
-        """Return unit of temperature."""
-        return UnitOfTemperature.CELSIUS
-
-    @property
-    def min_temp(self) -> float:
-        """Return the minimum temperature."""
-        return 15.0
-
-    @property
-    def max_temp(self) -> float:
-        """Return the maximum temperature."""
-        return 35.0
-
-    @property
-    def precision(self) -> float:
-        """Return the precision of the system."""
-        return 0.5
-
-    @property
-    def target_temperature_step(self) -> float:
-        """Return the supported step of target temperature."""
-        return 0.5
+        return None
 
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
@@ -187,36 +210,21 @@ class ExampleClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
                 and previous_state.state == HVACMode.HEAT
                 else 1
             )
+            self._update_attrs()
 
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
+        # The coordinator shows the new target until the controller echoes it.
         await self.coordinator.async_send_temp_command(
             self.device, kwargs.get("temperature")
         )
 
-    async def async_handle_set_hvac_mode_service(self, hvac_mode: str):
-        """Handle the service call."""
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        """Set new target hvac mode."""
         _LOGGER.debug("Set HVAC Mode: %s", hvac_mode)
-        if hvac_mode == HVACMode.OFF:
-            self.device.on = False
-        else:
-            self.device.on = True
-            self.device.mode = 0 if hvac_mode == HVACMode.HEAT else 1
+        # Only the on/off register is written, heating or cooling is chosen on
+        # the controller, which is why _attr_hvac_modes only offers its mode.
+        # The coordinator shows the new on/off state until the controller echoes it.
         await self.coordinator.async_send_toggle_command(
             self.device, hvac_mode != HVACMode.OFF
         )
-
-    @property
-    def unique_id(self) -> str:
-        """Return unique id."""
-        # All entities must have a unique id.  Think carefully what you want this to be as
-        # changing it later will cause HA to create new entities.
-        return f"{DOMAIN}-{self.device.device_unique_id}"
-
-    @property
-    def extra_state_attributes(self):
-        """Return the extra state attributes."""
-        # Add any additional attributes you want on your sensor.
-        attrs = {}
-        attrs["extra_info"] = "Extra Info"
-        return attrs
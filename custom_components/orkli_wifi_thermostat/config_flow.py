@@ -21,8 +21,24 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .api import PushAPI
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, MIN_SCAN_INTERVAL
+from .const import (
+    CONF_DEDUP_WINDOW,
+    CONF_EVENT_ADDRESSES,
+    CONF_EVENT_REGISTERS,
+    CONF_PASSIVE_LEARNING,
+    CONF_PUSH_ONLY,
+    CONF_REGISTER_EVENTS,
+    DEFAULT_DEDUP_WINDOW,
+    DEFAULT_PASSIVE_LEARNING,
+    DEFAULT_PUSH_ONLY,
+    DEFAULT_REGISTER_EVENTS,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MAX_DEDUP_WINDOW,
+    MIN_SCAN_INTERVAL,
+)
+from .helpers import parse_int_set
+from .pyorkli import PushAPI
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -129,9 +145,16 @@ class OrkliOptionsFlowHandler(OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Handle options flow."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            options = self.config_entry.options | user_input
-            return self.async_create_entry(data=options)
+            try:
+                parse_int_set(user_input.get(CONF_EVENT_ADDRESSES))
+                parse_int_set(user_input.get(CONF_EVENT_REGISTERS))
+            except ValueError:
+                errors["base"] = "invalid_filter"
+            else:
+                options = self.config_entry.options | user_input
+                return self.async_create_entry(data=options)
 
         data_schema = vol.Schema(
             {
@@ -141,10 +164,44 @@ class OrkliOptionsFlowHandler(OptionsFlow):
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
                 ): (vol.All(vol.Coerce(int), vol.Clamp(min=MIN_SCAN_INTERVAL))),
+                vol.Required(
+                    CONF_PUSH_ONLY,
+                    default=self.config_entry.options.get(
+                        CONF_PUSH_ONLY, DEFAULT_PUSH_ONLY
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_PASSIVE_LEARNING,
+                    default=self.config_entry.options.get(
+                        CONF_PASSIVE_LEARNING, DEFAULT_PASSIVE_LEARNING
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_DEDUP_WINDOW,
+                    default=self.config_entry.options.get(
+                        CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Clamp(min=0, max=MAX_DEDUP_WINDOW)),
+                vol.Required(
+                    CONF_REGISTER_EVENTS,
+                    default=self.config_entry.options.get(
+                        CONF_REGISTER_EVENTS, DEFAULT_REGISTER_EVENTS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_EVENT_ADDRESSES,
+                    default=self.config_entry.options.get(CONF_EVENT_ADDRESSES, ""),
+                ): str,
+                vol.Optional(
+                    CONF_EVENT_REGISTERS,
+                    default=self.config_entry.options.get(CONF_EVENT_REGISTERS, ""),
+                ): str,
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=data_schema)
+        return self.async_show_form(
+            step_id="init", data_schema=data_schema, errors=errors
+        )
 
 
 class CannotConnect(HomeAssistantError):
@@ -4,3 +4,43 @@ DOMAIN = "orkli_wifi_thermostat"
 
 DEFAULT_SCAN_INTERVAL = 15
 MIN_SCAN_INTERVAL = 15
+
+CONF_PUSH_ONLY = "push_only"
+DEFAULT_PUSH_ONLY = False
+# In push only mode, zones not refreshed for PUSH_STALE_TIMEOUT seconds are read
+# again. The check runs every PUSH_WATCHDOG_INTERVAL seconds.
+PUSH_WATCHDOG_INTERVAL = 60
+PUSH_STALE_TIMEOUT = 300
+# A register value repeated by the controller within this many seconds is
+# handled once, 0 handles every frame.
+CONF_DEDUP_WINDOW = "dedup_window"
+DEFAULT_DEDUP_WINDOW = 1.0
+MAX_DEDUP_WINDOW = 60.0
+
+CONF_PASSIVE_LEARNING = "passive_learning"
+DEFAULT_PASSIVE_LEARNING = False
+
+CONF_REGISTER_EVENTS = "register_events"
+CONF_EVENT_ADDRESSES = "event_addresses"
+CONF_EVENT_REGISTERS = "event_registers"
+DEFAULT_REGISTER_EVENTS = False
+EVENT_REGISTERS = f"{DOMAIN}_registers"
+# Register changes are collected for this many seconds and fired as one event.
+REGISTER_EVENT_WINDOW = 1.0
+
+SERVICE_PROFILE = "profile"
+ATTR_SECONDS = "seconds"
+DEFAULT_PROFILE_SECONDS = 60
+
+SERVICE_DUMP_STATE = "dump_state"
+ATTR_TIMEOUT = "timeout"
+# Seconds a state dump waits for the register replies, and seconds between
+# two of its reads so the controller is not flooded.
+DEFAULT_DUMP_TIMEOUT = 30
+DUMP_PACING = 0.05
+
+# Seconds between background refetches of the zone list from the controller.
+REDISCOVERY_INTERVAL = 6 * 60 * 60
+
+# Seconds an optimistic value waits for the controller echo before rolling back.
+OPTIMISTIC_TIMEOUT = 10
@@ -1,8 +1,13 @@
 """Example integration using DataUpdateCoordinator."""
 
-from dataclasses import dataclass
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from functools import partial
 import logging
+import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -12,15 +17,68 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_time_interval,
+    async_track_utc_time_change,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import APIAuthError, Device, Packet, PushAPI
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CONF_DEDUP_WINDOW,
+    CONF_EVENT_ADDRESSES,
+    CONF_EVENT_REGISTERS,
+    CONF_PASSIVE_LEARNING,
+    CONF_PUSH_ONLY,
+    CONF_REGISTER_EVENTS,
+    DEFAULT_DEDUP_WINDOW,
+    DEFAULT_PASSIVE_LEARNING,
+    DEFAULT_PUSH_ONLY,
+    DEFAULT_REGISTER_EVENTS,
+    DEFAULT_DUMP_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    DUMP_PACING,
+    EVENT_REGISTERS,
+    OPTIMISTIC_TIMEOUT,
+    PUSH_STALE_TIMEOUT,
+    PUSH_WATCHDOG_INTERVAL,
+    REDISCOVERY_INTERVAL,
+    REGISTER_EVENT_WINDOW,
+)
+from .helpers import parse_int_set
+from .pyorkli import (
+    APIAuthError,
+    Device,
+    Installation,
+    Packet,
+    PendingChange,
+    PushAPI,
+    create_packet,
+    write_packet,
+    zone_registers,
+)
+from .zone_statistics import ZoneStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# Device fields read from Instal.dat, as opposed to the ones pushed by the zones.
+INSTALLATION_FIELDS = (
+    "name",
+    "map",
+    "pos_x",
+    "pos_y",
+    "address",
+    "output",
+    "type",
+    "icon",
+)
+
+
 @dataclass
 class OrkliAPIData:
     """Class to hold api data."""
@@ -38,15 +96,51 @@ class OrkliCoordinator(DataUpdateCoordinator):
         """Initialize coordinator."""
 
         # Set variables from values entered in config flow setup
+        self.entry = config_entry
         self.host = config_entry.data[CONF_HOST]
         self.user = config_entry.data[CONF_USERNAME]
         self.pwd = config_entry.data[CONF_PASSWORD]
-        self.devices = [Device(**device) for device in config_entry.data[CONF_DEVICES]]
+        # Zones and register state, updated by every received frame.
+        self.installation = Installation(
+            [Device(**device) for device in config_entry.data[CONF_DEVICES]]
+        )
+
+        # Ids of the devices a targeted notification is about. It is only set
+        # while that notification runs, so refreshes, failed ones included,
+        # always notify every device.
+        self.updated_device_ids: set[int] | None = None
+        # (address, register) keys a running state dump still waits for, and its
+        # wake up event.
+        self._dump_lock = asyncio.Lock()
+        self._dump_outstanding: set[tuple[int, int]] = set()
+        self._dump_done = asyncio.Event()
 
         # set variables from options.  You need a default here incase options have not been set
         self.poll_interval = config_entry.options.get(
             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
         )
+        self.push_only = config_entry.options.get(CONF_PUSH_ONLY, DEFAULT_PUSH_ONLY)
+        self.passive_learning = config_entry.options.get(
+            CONF_PASSIVE_LEARNING, DEFAULT_PASSIVE_LEARNING
+        )
+        self.dedup_window = config_entry.options.get(
+            CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW
+        )
+        self.register_events = config_entry.options.get(
+            CONF_REGISTER_EVENTS, DEFAULT_REGISTER_EVENTS
+        )
+        self.event_addresses = parse_int_set(
+            config_entry.options.get(CONF_EVENT_ADDRESSES)
+        )
+        self.event_registers = parse_int_set(
+            config_entry.options.get(CONF_EVENT_REGISTERS)
+        )
+        # Register changes waiting for the next event, keyed like
+        # installation.registers.
+        self._register_changes: dict[tuple[int, int], dict[str, int]] = {}
+        self._cancel_register_event: CALLBACK_TYPE | None = None
+        # Kept to tell option changes, which need a reload, from zone list updates.
+        self.options = dict(config_entry.options)
 
         # Initialise DataUpdateCoordinator
         super().__init__(
@@ -55,10 +149,28 @@ class OrkliCoordinator(DataUpdateCoordinator):
             name=f"{DOMAIN} ({config_entry.unique_id})",
             # Set update method to get devices on first load.
             update_method=self.async_update_data,
-            # Do not set a polling interval as data will be pushed.
-            # You can remove this line but left here for explanatory purposes.
-            update_interval=timedelta(seconds=self.poll_interval),
+            # In push only mode only the first refresh polls, the watchdog
+            # takes care of zones that stop pushing.
+            update_interval=None
+            if self.push_only
+            else timedelta(seconds=self.poll_interval),
+        )
+
+        self._cancel_watchdog = (
+            async_track_time_interval(
+                hass,
+                self.async_watchdog,
+                timedelta(seconds=PUSH_WATCHDOG_INTERVAL),
+            )
+            if self.push_only
+            else None
         )
+        self._cancel_rediscovery = async_track_time_interval(
+            hass,
+            self.async_rediscover_devices,
+            timedelta(seconds=REDISCOVERY_INTERVAL),
+        )
+        self._new_devices_listeners: list[Callable[[list[Device]], None]] = []
 
         # Initialise your api here
         self.api = PushAPI(
@@ -66,44 +178,256 @@ class OrkliCoordinator(DataUpdateCoordinator):
             user=self.user,
             pwd=self.pwd,
             message_callback=self.devices_update_callback,
+            passive_callback=self.passive_update_callback
+            if self.passive_learning
+            else None,
+            dedup_window=self.dedup_window,
         )
 
+        # Hourly zone aggregates, only kept when the recorder can import them.
+        self.statistics: ZoneStatistics | None = None
+        self._cancel_statistics = None
+        if "recorder" in hass.config.components:
+            self.statistics = ZoneStatistics(self.api.controller_name)
+            self._cancel_statistics = async_track_utc_time_change(
+                hass, self.async_import_statistics, minute=0, second=0
+            )
+
     async def devices_update_callback(self, packet: Packet):
         """Receive callback from api with device update."""
         _LOGGER.debug("Received packet: %s", packet)
-        devices = [
-            Device(
-                device_id=device.device_id,
-                device_unique_id=device.device_unique_id,
-                name=device.name,
-                map=device.map,
-                pos_x=device.pos_x,
-                pos_y=device.pos_y,
-                address=device.address,
-                output=device.device_id,
-                type=device.type,
-                icon=device.icon,
-                dato1=device.dato1,
-                dato2=device.dato2,
-                current_temperature=packet.data2
-                if packet.data1 == device.device_id * 4 + 3 and packet.data2 != 0
-                else device.current_temperature,
-                current_humidity=packet.data2
-                if packet.data1 == device.device_id + 100 and packet.data2 != 0
-                else device.current_humidity,
-                target_temperature=packet.data2
-                if packet.data1 == device.device_id * 4 + 2 and packet.data2 != 0
-                else device.target_temperature,
-                mode=(packet.data2 & 15) % 2
-                if packet.data1 == device.device_id * 4 + 1 and packet.data2 != 0
-                else device.mode,
-                on=packet.data2 == 3
-                if packet.data1 == device.device_id * 4 and packet.data2 != 0
-                else device.on,
+        self.process_packet(packet)
+
+    async def passive_update_callback(self, packet: Packet):
+        """Receive callback from api with traffic between other nodes."""
+        self.process_packet(packet, passive=True)
+
+    def process_packet(self, packet: Packet, passive: bool = False) -> None:
+        """Apply a packet to the installation and notify the changes."""
+        key = (packet.ori, packet.data1)
+        register_changed = self.installation.registers.get(key) != packet.data2
+        changed = self.installation.process_packet(packet, passive)
+        if self._dump_outstanding and packet.data2 != 0:
+            self._dump_outstanding.discard(key)
+            if not self._dump_outstanding:
+                self._dump_done.set()
+        if register_changed and self.register_events:
+            self.queue_register_change(packet)
+        if changed:
+            self.updated_device_ids = changed
+            try:
+                self.async_set_updated_data(self.data)
+            finally:
+                self.updated_device_ids = None
+
+    def queue_register_change(self, packet: Packet) -> None:
+        """Add a register change to the next event, if it passes the filters."""
+        if self.event_addresses is not None and not (
+            packet.ori in self.event_addresses or packet.dst in self.event_addresses
+        ):
+            return
+        if self.event_registers is not None and packet.data1 not in self.event_registers:
+            return
+        # A register changing again within the window only reports its last value.
+        self._register_changes[(packet.ori, packet.data1)] = {
+            "address": packet.ori,
+            "destination": packet.dst,
+            "command": packet.cmd,
+            "register": packet.data1,
+            "value": packet.data2,
+        }
+        if self._cancel_register_event is None:
+            self._cancel_register_event = async_call_later(
+                self.hass, REGISTER_EVENT_WINDOW, self._async_fire_register_event
+            )
+
+    @callback
+    def _async_fire_register_event(self, now: datetime) -> None:
+        """Fire the register changes collected over the window as one event."""
+        self._cancel_register_event = None
+        changes = list(self._register_changes.values())
+        self._register_changes.clear()
+        self.hass.bus.async_fire(
+            EVENT_REGISTERS,
+            {"controller": self.api.controller_name, "changes": changes},
+        )
+
+    @callback
+    def async_set_optimistic(self, device: Device, field: str, value: Any) -> None:
+        """Show a commanded value until the controller echoes it or it times out."""
+        key = (device.device_id, field)
+        if pending := self.installation.pending.pop(key, None):
+            pending.cancel_timeout()
+            previous = pending.previous
+        else:
+            previous = getattr(device, field)
+        setattr(device, field, value)
+        self.installation.pending[key] = PendingChange(
+            previous,
+            value,
+            async_call_later(
+                self.hass, OPTIMISTIC_TIMEOUT, partial(self._async_rollback, key)
+            ),
+        )
+        self.async_update_device_listeners({device.device_id})
+
+    @callback
+    def _async_rollback(self, key: tuple[int, str], now: datetime | None = None):
+        """Restore the value from before an optimistic change."""
+        if (pending := self.installation.pending.pop(key, None)) is None:
+            return
+        pending.cancel_timeout()
+        device_id, field = key
+        if (device := self.installation.devices_by_id.get(device_id)) is None:
+            return
+        _LOGGER.debug("Zone %s %s not confirmed, rolling back", device_id, field)
+        setattr(device, field, pending.previous)
+        self.async_update_device_listeners({device_id})
+
+    @callback
+    def async_update_device_listeners(self, device_ids: set[int]) -> None:
+        """Notify the entities of the given devices only."""
+        self.updated_device_ids = device_ids
+        try:
+            self.async_update_listeners()
+        finally:
+            self.updated_device_ids = None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Record the updated zones in the statistics and notify the entities."""
+        if self.statistics is not None:
+            devices = (
+                self.installation.devices
+                if self.updated_device_ids is None
+                else [
+                    self.installation.devices_by_id[device_id]
+                    for device_id in self.updated_device_ids
+                    if device_id in self.installation.devices_by_id
+                ]
             )
-            for device in self.data.devices
+            self.statistics.async_update(devices, dt_util.utcnow())
+        super().async_update_listeners()
+
+    @callback
+    def async_import_statistics(self, now: datetime) -> None:
+        """Import the statistics of the hour that just ended."""
+        self.statistics.async_import(
+            self.hass,
+            self.installation.devices,
+            now.replace(minute=0, second=0, microsecond=0),
+        )
+
+    async def async_watchdog(self, now: datetime) -> None:
+        """Read the zones that have not pushed any register for too long."""
+        deadline = time.monotonic() - PUSH_STALE_TIMEOUT
+        for device in self.installation.devices:
+            last_refresh = self.installation.last_refresh.get(device.device_id)
+            if last_refresh is None or last_refresh < deadline:
+                _LOGGER.debug("Zone %s is stale, reading it", device.device_id)
+                await self.async_send_read_command(device)
+
+    @callback
+    def async_add_new_devices_listener(
+        self, update_callback: Callable[[list[Device]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for devices found by the background rediscovery."""
+        self._new_devices_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._new_devices_listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_rediscover_devices(self, now: datetime | None = None) -> None:
+        """Refetch the zone list and apply the differences in place.
+
+        Only the added, removed or renamed zones are touched, the connection and
+        the other entities are left alone.
+        """
+        discovered = await self.api.async_get_initial_devices()
+        if not discovered:
+            # Also returned when the download fails, never drop every zone on it.
+            _LOGGER.debug("Rediscovery returned no zones, keeping the current ones")
+            return
+
+        discovered_ids = {device.device_id for device in discovered}
+        removed = [
+            device
+            for device in self.installation.devices
+            if device.device_id not in discovered_ids
         ]
-        self.async_set_updated_data(OrkliAPIData(self.api.controller_name, devices))
+        added = []
+        changed = set()
+        for new_device in discovered:
+            device = self.installation.devices_by_id.get(new_device.device_id)
+            if device is None:
+                added.append(new_device)
+                continue
+            for field in INSTALLATION_FIELDS:
+                if getattr(device, field) != getattr(new_device, field):
+                    setattr(device, field, getattr(new_device, field))
+                    changed.add(device.device_id)
+
+        if not (added or removed or changed):
+            return
+        _LOGGER.debug(
+            "Zones changed, added: %s removed: %s updated: %s",
+            [device.device_id for device in added],
+            [device.device_id for device in removed],
+            changed,
+        )
+
+        # Updated in place, self.data.devices is this same list.
+        self.installation.devices[:] = [
+            device
+            for device in self.installation.devices
+            if device.device_id in discovered_ids
+        ] + added
+        self.installation.rebuild_register_index()
+        self.hass.config_entries.async_update_entry(
+            self.entry,
+            data={
+                **self.entry.data,
+                CONF_DEVICES: [asdict(device) for device in self.installation.devices],
+            },
+        )
+
+        device_registry = dr.async_get(self.hass)
+        for device in removed:
+            self.installation.forget_device(device.device_id)
+            if self.statistics is not None:
+                self.statistics.async_remove(device.device_id)
+            # Removing the registry device also removes its climate entity.
+            if registry_device := device_registry.async_get_device(
+                identifiers={self.device_identifier(device)}
+            ):
+                device_registry.async_remove_device(registry_device.id)
+        for device_id in changed:
+            device = self.installation.devices_by_id[device_id]
+            if registry_device := device_registry.async_get_device(
+                identifiers={self.device_identifier(device)}
+            ):
+                device_registry.async_update_device(
+                    registry_device.id, name=self.device_display_name(device)
+                )
+
+        if added:
+            for update_callback in self._new_devices_listeners:
+                update_callback(added)
+            for device in added:
+                await self.async_send_read_command(device)
+        if changed:
+            self.async_update_device_listeners(changed)
+
+    def device_identifier(self, device: Device) -> tuple[str, str]:
+        """Return the device registry identifier of a zone."""
+        return (DOMAIN, f"{self.api.controller_name}-{device.device_id}")
+
+    def device_display_name(self, device: Device) -> str:
+        """Return the device registry name of a zone."""
+        return f"Thermostat {device.name}: {device.device_id}"
 
     async def connect_api(self):
         """Connect to api."""
@@ -119,10 +443,14 @@ class OrkliCoordinator(DataUpdateCoordinator):
         on: bool,
     ) -> bool:
         """Send a toggle command to a device."""
-        cmd = self.create_packet(
-            device.address, 255, 4, device.device_id * 4, 3 if on else 2
+        cmd = write_packet(
+            device.address, zone_registers(device.device_id)["on"], 3 if on else 2
         )
-        return await self.async_send_command(cmd)
+        self.async_set_optimistic(device, "on", on)
+        if not await self.async_send_command(cmd):
+            self._async_rollback((device.device_id, "on"))
+            return False
+        return True
 
     async def async_send_temp_command(
         self,
@@ -130,18 +458,88 @@ class OrkliCoordinator(DataUpdateCoordinator):
         temp: float,
     ) -> bool:
         """Send a temperature command to a device."""
-        cmd = self.create_packet(
-            device.address, 255, 4, device.device_id * 4 + 2, int(temp * 2)
+        registers = zone_registers(device.device_id)
+        cmd = write_packet(
+            device.address, registers["target_temperature"], int(temp * 2)
         )
-        return await self.async_send_command(cmd) and await self.async_send_command(
-            self.create_packet(device.address, 255, 4, device.device_id * 4 + 3, 0)
+        self.async_set_optimistic(device, "target_temperature", int(temp * 2))
+        if not await self.async_send_command(cmd):
+            self._async_rollback((device.device_id, "target_temperature"))
+            return False
+        return await self.async_send_command(
+            write_packet(device.address, registers["current_temperature"], 0)
         )
 
     async def async_send_read_command(self, device: Device) -> bool:
         """Send a read command to a device."""
-        cmd = self.create_packet(device.address, 255, 4, device.device_id * 4 + 3, 0)
+        cmd = write_packet(
+            device.address, zone_registers(device.device_id)["current_temperature"], 0
+        )
         return await self.async_send_command(cmd)
 
+    async def async_dump_state(
+        self, timeout: float = DEFAULT_DUMP_TIMEOUT
+    ) -> dict[str, Any]:
+        """Read the current temperature of every zone and return the snapshot.
+
+        Only the current temperature register is read, as writing 0 is only
+        known to read that one, the other zone registers are reported from the
+        values last pushed. The reads are paced by DUMP_PACING and the replies
+        are collected by process_packet. Zones not answering before the timeout
+        are listed as missing.
+        """
+        async with self._dump_lock:
+            requests = {
+                (
+                    device.address,
+                    zone_registers(device.device_id)["current_temperature"],
+                )
+                for device in self.installation.devices
+            }
+
+            self._dump_done.clear()
+            self._dump_outstanding = set(requests)
+            try:
+                async with asyncio.timeout(timeout):
+                    for key in sorted(requests):
+                        # A reply repeating a value received within the dedup
+                        # window is suppressed by the api, that value is current.
+                        fresh_after = time.monotonic() - self.api.dedup_window
+                        if (
+                            self.installation.register_times.get(key, fresh_after)
+                            > fresh_after
+                        ):
+                            self._dump_outstanding.discard(key)
+                        if key not in self._dump_outstanding:
+                            continue
+                        await self.async_send_command(write_packet(*key, 0))
+                        await asyncio.sleep(DUMP_PACING)
+                    if self._dump_outstanding:
+                        await self._dump_done.wait()
+            except TimeoutError:
+                _LOGGER.debug(
+                    "State dump timed out waiting for registers %s",
+                    sorted(self._dump_outstanding),
+                )
+            finally:
+                missing = self._dump_outstanding
+                self._dump_outstanding = set()
+
+            return {
+                "controller": self.api.controller_name,
+                "devices": [asdict(device) for device in self.installation.devices],
+                "registers": [
+                    {"address": address, "register": register, "value": value}
+                    for (address, register), value in sorted(
+                        self.installation.registers.items()
+                    )
+                ],
+                "missing": [
+                    {"address": address, "register": register}
+                    for address, register in sorted(missing)
+                ],
+            }
+
     async def async_send_command(self, command: Packet) -> bool:
         """Send command to device."""
         return await self.api.async_send_command(command)
@@ -163,51 +561,43 @@ class OrkliCoordinator(DataUpdateCoordinator):
             # This will show entities as unavailable by raising UpdateFailed exception
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-        devices = (
-            self.data.devices
-            if self.data is not None and self.data.devices is not None
-            else self.devices
-        )
-
-        for device in devices:
-            await self.async_send_command(self.create_packet(1, 254, 4, 35, 0))
-            await self.async_send_command(self.create_packet(1, 255, 10, 0, 0))
-            await self.async_send_command(self.create_packet(255, 255, 10, 0, 0))
+        # The probes are controller wide, so send them once per refresh.
+        await self.async_send_command(create_packet(1, 254, 4, 35, 0))
+        await self.async_send_command(create_packet(1, 255, 10, 0, 0))
+        await self.async_send_command(create_packet(255, 255, 10, 0, 0))
+        # Zones already seen on the bus since the last refresh need no read.
+        seen_after = time.monotonic() - self.poll_interval
+        for device in self.installation.devices:
+            if (
+                self.installation.last_seen_on_bus.get(device.device_id, seen_after)
+                > seen_after
+            ):
+                continue
             await self.async_send_read_command(device)
             # await asyncio.sleep(0.2)
 
         # What is returned here is stored in self.data by the DataUpdateCoordinator
-        return OrkliAPIData(self.api.controller_name, devices)
+        return OrkliAPIData(self.api.controller_name, self.installation.devices)
 
     async def async_shutdown(self) -> None:
         """Run shutdown clean up."""
         await super().async_shutdown()
+        if self._cancel_watchdog:
+            self._cancel_watchdog()
+            self._cancel_watchdog = None
+        self._cancel_rediscovery()
+        if self._cancel_statistics:
+            self._cancel_statistics()
+            self._cancel_statistics = None
+        if self._cancel_register_event:
+            self._cancel_register_event()
+            self._cancel_register_event = None
+        for pending in self.installation.pending.values():
+            pending.cancel_timeout()
+        self.installation.pending.clear()
         await self.disconnect_api()
 
     def get_device_by_id(self, device_id: int) -> Device | None:
         """Return device by device id."""
-        # Called by the binary sensors and sensors to get their updated data from self.data
-        try:
-            return [
-                device for device in self.data.devices if device.device_id == device_id
-            ][0]
-        except IndexError:
-            return None
-
-    def create_packet(
-        self, dst: int, ori: int, cmd: int, data1: int, data2: int
-    ) -> Packet:
-        """Create a message."""
-        return Packet(
-            bytes(
-                [
-                    0x3B, # starting byte
-                    dst,
-                    ori,
-                    cmd,
-                    data1,
-                    data2,
-                    sum([dst, ori, cmd, data1, data2]) & 0xFF, # checksum byte
-                ]
-            )
-        )
+        # Called by the entities to get their updated data
+        return self.installation.devices_by_id.get(device_id)
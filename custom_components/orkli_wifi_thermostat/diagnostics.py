@@ -0,0 +1,44 @@
+"""Diagnostics support for the Orkli Wifi Thermostat integration."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import OrkliCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the diagnostics of a config entry."""
+    coordinator: OrkliCoordinator = hass.data[DOMAIN][config_entry.entry_id].coordinator
+    installation = coordinator.installation
+    now = time.monotonic()
+    return {
+        "entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
+        "receive": {
+            "frames_dispatched": coordinator.api.frames_dispatched,
+            "frames_suppressed": coordinator.api.frames_suppressed,
+            "discarded_bytes": coordinator.api.parser.discarded_bytes,
+        },
+        "passive": {
+            # Seconds since each zone was last seen on the bus.
+            "last_seen_on_bus": {
+                device_id: round(now - seen, 1)
+                for device_id, seen in installation.last_seen_on_bus.items()
+            },
+            "unknown_traffic": [
+                {"destination": dst, "origin": ori, "command": cmd, "frames": count}
+                for (dst, ori, cmd), count in installation.unknown_traffic.most_common()
+            ],
+        },
+    }
@@ -0,0 +1,13 @@
+"""Helpers shared by the config flow and the coordinator.
+
+Kept apart from the coordinator so the config flow does not load it.
+"""
+
+from __future__ import annotations
+
+
+def parse_int_set(value: str | None) -> set[int] | None:
+    """Parse a comma separated list of integers, None meaning no filter."""
+    if not value or not value.strip():
+        return None
+    return {int(item) for item in value.split(",") if item.strip()}
@@ -0,0 +1,52 @@
+"""Client for the Orkli Wi-Fi thermostat controller.
+
+This package does not depend on Home Assistant, so it can be used from plain
+scripts by putting the integration directory on sys.path and importing
+pyorkli. The FTP discovery lives in pyorkli.discovery and is only imported
+when the zone list is fetched. Installation keeps the zones up to date from the
+received frames, the same way the integration does.
+"""
+
+from .client import API, APIAuthError, APIConnectionError, PushAPI
+from .codec import (
+    FRAME_LENGTH,
+    START_BYTE,
+    FrameParser,
+    Packet,
+    create_packet,
+    decode_register,
+    is_valid_message,
+    raw_to_humidity,
+    raw_to_target_temperature,
+    raw_to_temperature,
+    raw_to_temperature_rate,
+    write_packet,
+    zone_registers,
+)
+from .installation import Installation, PendingChange
+from .models import Device
+from .trend import TemperatureTrend
+
+__all__ = [
+    "API",
+    "APIAuthError",
+    "APIConnectionError",
+    "Device",
+    "FRAME_LENGTH",
+    "FrameParser",
+    "Installation",
+    "Packet",
+    "PendingChange",
+    "PushAPI",
+    "START_BYTE",
+    "TemperatureTrend",
+    "create_packet",
+    "decode_register",
+    "is_valid_message",
+    "raw_to_humidity",
+    "raw_to_target_temperature",
+    "raw_to_temperature",
+    "raw_to_temperature_rate",
+    "write_packet",
+    "zone_registers",
+]
@@ -0,0 +1,257 @@
+"""Connection to the Orkli controller."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import contextlib
+from collections.abc import Callable
+import logging
+import socket
+import time
+
+from .codec import FrameParser, Packet, is_valid_message
+from .models import Device
+
+_LOGGER = logging.getLogger(__name__)
+
+# A register value repeated within this many seconds is dispatched once.
+DEFAULT_DEDUP_WINDOW = 0.5
+# Upper bound of the registers remembered for duplicate suppression.
+MAX_RECENT_REGISTERS = 512
+# Bytes read from the socket at once.
+RECEIVE_BUFFER_SIZE = 4096
+# TCP port the controller listens on.
+DEFAULT_PORT = 12345
+
+
+class API:
+    """Class for example API."""
+
+    def __init__(
+        self, host: str, user: str, pwd: str, port: int = DEFAULT_PORT
+    ) -> None:
+        """Initialise."""
+        self.host = host
+        self.port = port
+        self.user = user
+        self.pwd = pwd
+        self.connected: bool = False
+        self.socket = None
+
+    @property
+    def controller_name(self) -> str:
+        """Return the name of the controller."""
+        return self.host.replace(".", "_")
+
+    def connect(self) -> bool:
+        """Connect to api."""
+        # if self.user == "test" and self.pwd == "1234":
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.connect((self.host, self.port))
+            self.socket.setblocking(0)
+            self.connected = True
+            return True
+        except Exception as ex:
+            self.disconnect()
+            raise APIAuthError("Error connecting to api. Invalid username or password.")
+
+    def disconnect(self) -> bool:
+        """Disconnect from api."""
+        self.connected = False
+        self.socket.close()
+        return True
+
+    def get_initial_devices(self) -> list[Device]:
+        """Get devices on api."""
+        # Imported here so ftplib is only loaded when discovering zones.
+        from .discovery import get_initial_devices
+
+        return get_initial_devices(self.controller_name, self.user, self.pwd)
+
+    def isValidMessage(self, message: bytes) -> bool:
+        """Check if message is valid."""
+        if not is_valid_message(message):
+            return False
+        _LOGGER.debug("Valid message: %s", message)
+        return True
+
+    def get_updated_devices(self, packet: Packet) -> Packet:
+        """Get devices on api."""
+        return packet
+
+
+class PushAPI(API):
+    """Mimic for a push api."""
+
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        pwd: str,
+        message_callback: Callable | None = None,
+        passive_callback: Callable | None = None,
+        dedup_window: float = DEFAULT_DEDUP_WINDOW,
+        port: int = DEFAULT_PORT,
+    ) -> None:
+        """Initialise."""
+        super().__init__(host, user, pwd, port)
+        self.message_callback = message_callback
+        # Called with the frames exchanged between other nodes, if set.
+        self.passive_callback = passive_callback
+        self._task: asyncio.Task = None
+
+        # Last value dispatched of each (dst, ori, data1) register and its
+        # arrival time, oldest first.
+        self.dedup_window = dedup_window
+        self._recent_registers: OrderedDict[tuple[int, int, int], tuple[int, float]] = (
+            OrderedDict()
+        )
+        self.frames_dispatched = 0
+        self.frames_suppressed = 0
+        self.parser = FrameParser()
+
+    async def async_connect(self) -> bool:
+        """Connect tothe api.
+
+        In this case we will create a task to add the device update function call
+        to the event loop and return. Any previous connection and its receive
+        task are stopped first, so a single task ever reads the socket.
+        """
+        if self.connected or self._task:
+            await self.async_disconnect()
+        if super().connect():
+            self.parser.reset()
+            if self.message_callback:
+                loop = asyncio.get_running_loop()
+                self._task = loop.create_task(self.async_update_devices())
+        return True
+
+    async def async_disconnect(self) -> bool:
+        """Disconnect from api.
+
+        The receive task is cancelled and awaited before the socket is closed,
+        a read pending on a closed socket would never return.
+        """
+        task, self._task = self._task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if self.connected:
+            super().disconnect()
+        return True
+
+    async def async_reconnect(self) -> bool:
+        """Reopen the connection after a receive or send failure.
+
+        This is the only place a lost connection is reopened. If the controller
+        cannot be reached the api is left disconnected, and the next command or
+        refresh connects again.
+        """
+        try:
+            return await self.async_connect()
+        except APIAuthError as err:
+            _LOGGER.error("Reconnection failed: %s", err)
+            await self.async_disconnect()
+            return False
+
+    async def async_get_initial_devices(self) -> list[Device]:
+        """Async version of get_initial_devices."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_initial_devices)
+
+    def is_duplicate(self, message: bytes) -> bool:
+        """Return whether a frame repeats the current value of its register.
+
+        Only a value equal to the last one dispatched for the same destination,
+        source address and register within the dedup window is suppressed, so a
+        register going back to a previous value is always dispatched. Only
+        frames about to be dispatched may be checked, a frame checked and then
+        dropped would hide the next one.
+        """
+        if self.dedup_window <= 0:
+            return False
+        now = time.monotonic()
+        recent_registers = self._recent_registers
+        while recent_registers:
+            _, oldest = next(iter(recent_registers.values()))
+            if now - oldest < self.dedup_window:
+                break
+            recent_registers.popitem(last=False)
+        key = (message[1], message[2], message[4])
+        value = message[5]
+        last = recent_registers.get(key)
+        if last is not None and last[0] == value:
+            # The arrival time is not refreshed, so a value repeated forever is
+            # still dispatched once per window.
+            return True
+        recent_registers[key] = (value, now)
+        recent_registers.move_to_end(key)
+        if len(recent_registers) > MAX_RECENT_REGISTERS:
+            recent_registers.popitem(last=False)
+        return False
+
+    async def async_update_devices(self) -> None:
+        """Loop receiving the frames pushed by the controller.
+
+        The loop stops once another connection replaced the one it reads, and
+        reconnects when its own connection is lost.
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        sock = self.socket
+        while self._task is task:
+            try:
+                # Waits on the socket readiness instead of polling it, so frames
+                # are handled as they arrive and the loop yields between reads.
+                data = await loop.sock_recv(sock, RECEIVE_BUFFER_SIZE)
+            except OSError:
+                _LOGGER.error("Connection reset by peer. Reconnecting... ")
+                break
+            if not data:
+                break  # Connection closed
+            for message in self.parser.feed(data):
+                packet = Packet(message)
+                _LOGGER.debug("Received valid message: %s", packet)
+                if packet.dst == 1:
+                    callback = self.message_callback
+                elif self.passive_callback:
+                    callback = self.passive_callback
+                else:  # si destino != direccion no actualizar valores, investigar qué es
+                    _LOGGER.debug("Invalid destination: %s", packet.dst)
+                    continue
+                if self.is_duplicate(message):
+                    self.frames_suppressed += 1
+                    continue
+                self.frames_dispatched += 1
+                await callback(packet)
+        if self._task is task:
+            await self.async_reconnect()
+
+    async def async_send_command(self, command: Packet) -> bool:
+        """Send a command to a device."""
+
+        if not self.connected:
+            await self.async_connect()
+        try:
+            _LOGGER.debug("Sending command: %s", command)
+            s = self.socket.send(command.message)
+            if s != 7:
+                _LOGGER.error("Length error sending command: %s", command)
+                await self.async_reconnect()
+                return False
+            return True
+        except Exception as e:
+            _LOGGER.error("Error sending command: %s", e)
+            await self.async_reconnect()
+            return False
+
+
+class APIAuthError(Exception):
+    """Exception class for auth error."""
+
+
+class APIConnectionError(Exception):
+    """Exception class for connection error."""
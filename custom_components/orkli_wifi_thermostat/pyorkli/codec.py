@@ -0,0 +1,148 @@
+"""Wire format of the Orkli controller frames and registers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# First byte of every frame and length of a frame, start byte included.
+START_BYTE = 0x3B
+FRAME_LENGTH = 7
+
+
+def is_valid_message(message: bytes) -> bool:
+    """Check the start byte, length and checksum of a frame."""
+    return (
+        len(message) == FRAME_LENGTH
+        and message[0] == START_BYTE
+        and message[-1] == (sum(message[1:-1]) & 0xFF)
+    )
+
+
+class FrameParser:
+    """Split a byte stream received in arbitrary chunks into valid frames.
+
+    A frame cut between two chunks is completed with the next one, and bytes
+    that do not start a valid frame are skipped one at a time until the stream
+    is in sync again. Only an incomplete frame is kept between chunks, so the
+    buffer never holds more than FRAME_LENGTH - 1 bytes.
+    """
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self.buffer = bytearray()
+        self.discarded_bytes = 0
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Add received bytes and return the complete valid frames."""
+        buffer = self.buffer
+        buffer += data
+        frames = []
+        pos = 0
+        while True:
+            idx = buffer.find(START_BYTE, pos)
+            if idx == -1:
+                self.discarded_bytes += len(buffer) - pos
+                pos = len(buffer)
+                break
+            self.discarded_bytes += idx - pos
+            if len(buffer) - idx < FRAME_LENGTH:
+                # Incomplete frame, wait for the rest of it.
+                pos = idx
+                break
+            message = bytes(buffer[idx : idx + FRAME_LENGTH])
+            if is_valid_message(message):
+                frames.append(message)
+                pos = idx + FRAME_LENGTH
+            else:
+                self.discarded_bytes += 1
+                pos = idx + 1
+        del buffer[:pos]
+        return frames
+
+    def reset(self) -> None:
+        """Drop any incomplete frame, used when the connection is reopened."""
+        self.buffer.clear()
+
+
+@dataclass
+class Packet:
+    """API packet."""
+
+    message: bytes
+
+    def __post_init__(self):
+        """Initialise."""
+        self.start = self.message[0]
+        self.dst = self.message[1]
+        self.ori = self.message[2]
+        self.cmd = self.message[3]
+        self.data1 = self.message[4]
+        self.data2 = self.message[5]
+        self.end = self.message[6]
+
+    def __repr__(self):
+        """Return string representation."""
+        return f"Packet: dst: {self.dst} ori: {self.ori} cmd:{self.cmd} data1:{self.data1} data2:{self.data2}"
+
+
+def create_packet(dst: int, ori: int, cmd: int, data1: int, data2: int) -> Packet:
+    """Create a frame, adding the start and checksum bytes."""
+    return Packet(
+        bytes(
+            [
+                START_BYTE,
+                dst,
+                ori,
+                cmd,
+                data1,
+                data2,
+                (dst + ori + cmd + data1 + data2) & 0xFF,
+            ]
+        )
+    )
+
+
+def write_packet(address: int, register: int, value: int) -> Packet:
+    """Create a frame writing a register of a zone, a value of 0 reads it."""
+    return create_packet(address, 255, 4, register, value)
+
+
+def zone_registers(device_id: int) -> dict[str, int]:
+    """Return the registers of a zone keyed by the device field they hold."""
+    return {
+        "on": device_id * 4,
+        "mode": device_id * 4 + 1,
+        "target_temperature": device_id * 4 + 2,
+        "current_temperature": device_id * 4 + 3,
+        "current_humidity": device_id + 100,
+    }
+
+
+def decode_register(field: str, value: int) -> bool | int:
+    """Return the device field value held by a raw register value."""
+    match field:
+        case "on":
+            return value == 3
+        case "mode":
+            return (value & 15) % 2
+    return value
+
+
+def raw_to_temperature(raw: float | None) -> float | None:
+    """Convert a raw current temperature register to degrees Celsius."""
+    return (162.0 - float(raw)) / 2.0 if raw is not None else None
+
+
+def raw_to_temperature_rate(raw_rate: float | None) -> float | None:
+    """Convert a raw current temperature change per second to Celsius per hour."""
+    return -raw_rate * 3600.0 / 2.0 if raw_rate is not None else None
+
+
+def raw_to_target_temperature(raw: float | None) -> float | None:
+    """Convert a raw target temperature register to degrees Celsius."""
+    return float(raw) / 2.0 if raw is not None else None
+
+
+def raw_to_humidity(raw: float | None) -> int | None:
+    """Convert a raw humidity register to a relative humidity percentage."""
+    return int(float(raw) / 2.55) if raw is not None else None
@@ -0,0 +1,72 @@
+"""Discovery of the zones of an Orkli installation.
+
+The zone list is read from the Instal.dat file the controller publishes on the
+Orkli FTP server, eight lines per zone.
+"""
+
+from __future__ import annotations
+
+from ftplib import FTP
+import io
+import logging
+
+from .models import Device, device_name, device_unique_id, new_device
+
+_LOGGER = logging.getLogger(__name__)
+
+FTP_SERVER = "85.152.52.212"
+FTP_PORT = 21
+# FTP_SERVER = "192.168.1.130"
+# FTP_PORT = 1021
+
+
+def get_initial_devices(controller_name: str, user: str, pwd: str) -> list[Device]:
+    """Download and parse the zone list, an empty list meaning it failed."""
+    try:
+        return parse_installation(controller_name, fetch_installation(user, pwd))
+    except Exception as ex:
+        _LOGGER.error("Error reading file: %s", ex)
+        return []
+
+
+def fetch_installation(user: str, pwd: str) -> str:
+    """Download Instal.dat from the Orkli FTP server."""
+    ftp = FTP()
+    ftp.connect(FTP_SERVER, FTP_PORT)
+    try:
+        ftp.login(user, pwd)
+        file_data = io.BytesIO()
+        ftp.retrbinary("RETR Instal.dat", file_data.write)
+    finally:
+        ftp.close()
+    return file_data.getvalue().decode("utf-8")
+
+
+def parse_installation(controller_name: str, content: str) -> list[Device]:
+    """Parse the zones of an Instal.dat file."""
+    newDevice: Device
+    devices: list[Device] = []
+    for idx, value in enumerate(content.splitlines()):
+        match idx % 8:
+            case 0:
+                newDevice = new_device(controller_name, int(value))
+            case 1:
+                newDevice.name = device_name(value)
+            case 2:
+                newDevice.pos_x = int(value)
+            case 3:
+                newDevice.pos_y = int(value)
+            case 4:
+                newDevice.address = int(value)
+            case 5:
+                newDevice.output = int(value)
+                newDevice.device_id = newDevice.output
+                newDevice.device_unique_id = device_unique_id(
+                    controller_name, newDevice.output
+                )
+            case 6:
+                newDevice.type = int(value)
+            case 7:
+                newDevice.icon = int(value)
+                devices.append(newDevice)
+    return devices
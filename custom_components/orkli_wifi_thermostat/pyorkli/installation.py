@@ -0,0 +1,155 @@
+"""Zone state of an Orkli installation, updated from the controller frames."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from .codec import Packet, decode_register, zone_registers
+from .models import Device
+from .trend import TemperatureTrend
+
+_LOGGER = logging.getLogger(__name__)
+
+# Distinct (dst, ori, cmd) patterns counted for frames no zone register matches.
+MAX_UNKNOWN_TRAFFIC_PATTERNS = 256
+# Current temperature samples kept per zone for the warming rate, at least
+# TREND_SAMPLE_INTERVAL seconds apart.
+TREND_SAMPLES = 32
+TREND_SAMPLE_INTERVAL = 60
+
+
+@dataclass
+class PendingChange:
+    """Optimistic value waiting for the controller to echo it."""
+
+    previous: Any
+    expected: Any
+    cancel_timeout: Callable[[], None]
+
+
+class Installation:
+    """Zones of a controller and the registers seen on its bus.
+
+    Holds the per frame work of the integration, without Home Assistant, so
+    scripts and the scale tests run the same code as the coordinator.
+    """
+
+    def __init__(self, devices: list[Device]) -> None:
+        """Initialise."""
+        self.devices = devices
+        self.devices_by_id: dict[int, Device] = {}
+        self.register_index: dict[int, list[tuple[Device, str]]] = {}
+        self.rebuild_register_index()
+
+        # Monotonic time of the last register received for each device id.
+        self.last_refresh: dict[int, float] = {}
+        # Monotonic time a device was last seen in traffic between other nodes.
+        self.last_seen_on_bus: dict[int, float] = {}
+        # Last value of every register seen, keyed by source address and register.
+        self.registers: dict[tuple[int, int], int] = {}
+        # Monotonic time each of those registers was last received.
+        self.register_times: dict[tuple[int, int], float] = {}
+        # Frames no zone register matches, counted by (dst, ori, cmd).
+        self.unknown_traffic: Counter[tuple[int, int, int]] = Counter()
+        # Recent current temperature samples of each device id.
+        self.trends: dict[int, TemperatureTrend] = {}
+        # Optimistic values keyed by device id and field.
+        self.pending: dict[tuple[int, str], PendingChange] = {}
+
+    def rebuild_register_index(self) -> None:
+        """Rebuild the register and device lookup tables."""
+        self.register_index.clear()
+        for device in self.devices:
+            for field, register in zone_registers(device.device_id).items():
+                self.register_index.setdefault(register, []).append((device, field))
+        self.devices_by_id = {device.device_id: device for device in self.devices}
+
+    def forget_device(self, device_id: int) -> None:
+        """Drop the state kept for a removed zone."""
+        self.last_refresh.pop(device_id, None)
+        self.last_seen_on_bus.pop(device_id, None)
+        self.trends.pop(device_id, None)
+
+    def process_packet(self, packet: Packet, passive: bool = False) -> set[int]:
+        """Apply a frame to the zone fields it holds and return the changed ids.
+
+        Only the zones listening on the register are touched, so the cost of a
+        frame does not grow with the number of zones on the controller. Frames
+        between other nodes only update the zones taking part in the exchange.
+        """
+        now = time.monotonic()
+        key = (packet.ori, packet.data1)
+        self.register_times[key] = now
+        self.registers[key] = packet.data2
+        targets = self.register_index.get(packet.data1, ())
+        if passive:
+            targets = [
+                (device, field)
+                for device, field in targets
+                if device.address in (packet.ori, packet.dst)
+            ]
+        if not targets:
+            self.count_unknown_traffic(packet)
+            return set()
+        changed = set()
+        for device, field in targets:
+            self.last_refresh[device.device_id] = now
+            if field == "current_temperature" and packet.data2 != 0:
+                self.add_trend_sample(device, now, packet.data2)
+                if passive:
+                    # The value the poll reads is on the bus, a read request
+                    # (value 0) or another register does not spare the poll.
+                    self.last_seen_on_bus[device.device_id] = now
+            if self.apply_register(device, field, packet.data2):
+                changed.add(device.device_id)
+        return changed
+
+    def add_trend_sample(self, device: Device, now: float, raw: int) -> None:
+        """Add a raw current temperature to the trend of a device."""
+        trend = self.trends.get(device.device_id)
+        if trend is None:
+            trend = self.trends[device.device_id] = TemperatureTrend(TREND_SAMPLES)
+        elif now - trend.last_time < TREND_SAMPLE_INTERVAL:
+            return
+        trend.add(now, raw)
+
+    def count_unknown_traffic(self, packet: Packet) -> None:
+        """Count a frame no zone register matches by its traffic pattern."""
+        pattern = (packet.dst, packet.ori, packet.cmd)
+        if (
+            pattern in self.unknown_traffic
+            or len(self.unknown_traffic) < MAX_UNKNOWN_TRAFFIC_PATTERNS
+        ):
+            self.unknown_traffic[pattern] += 1
+        else:
+            _LOGGER.debug("Unknown traffic pattern not counted: %s", pattern)
+            return
+        if self.unknown_traffic[pattern] == 1:
+            _LOGGER.debug("New unknown traffic pattern (dst, ori, cmd): %s", pattern)
+
+    def apply_register(self, device: Device, field: str, value: int) -> bool:
+        """Store a register value on a device and return whether it changed."""
+        if value == 0:
+            return False
+        new_value = decode_register(field, value)
+        if pending := self.pending.pop((device.device_id, field), None):
+            # The echo confirms the optimistic value, anything else from the
+            # controller wins over it.
+            pending.cancel_timeout()
+            if new_value != pending.expected:
+                _LOGGER.debug(
+                    "Zone %s %s is %s, expected %s",
+                    device.device_id,
+                    field,
+                    new_value,
+                    pending.expected,
+                )
+        if getattr(device, field) == new_value:
+            return False
+        setattr(device, field, new_value)
+        return True
@@ -0,0 +1,61 @@
+"""Zones of an Orkli installation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class Device:
+    """API device."""
+
+    device_id: int
+    device_unique_id: str
+    name: str
+    map: int
+    pos_x: int
+    pos_y: int
+    address: int
+    output: int
+    type: int
+    icon: int
+    dato1: int
+    dato2: int
+    current_temperature: int | None
+    target_temperature: int | None
+    current_humidity: int | None
+    mode: int
+    on: bool
+
+
+def device_unique_id(controller_name: str, device_id: int) -> str:
+    """Return a unique device id."""
+    return f"{controller_name}_{device_id}"
+
+
+def device_name(label: str) -> str:
+    """Return the device name."""
+    return f"Climate {label}"
+
+
+def new_device(controller_name: str, map: int) -> Device:
+    """Return a device with the defaults of a zone not fully read yet."""
+    return Device(
+        device_id=0,
+        device_unique_id=device_unique_id(controller_name, 0),
+        name="",
+        map=map,
+        pos_x=0,
+        pos_y=0,
+        address=0,
+        output=0,
+        type=49,
+        icon=0,
+        dato1=2,
+        dato2=0,
+        current_temperature=None,
+        current_humidity=None,
+        target_temperature=None,
+        mode=0,
+        on=False,
+    )
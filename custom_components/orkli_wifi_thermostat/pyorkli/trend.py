@@ -0,0 +1,81 @@
+"""Warming rate estimation of the Orkli zones."""
+
+from __future__ import annotations
+
+from array import array
+
+
+class TemperatureTrend:
+    """Least squares line over the last samples of a raw zone temperature.
+
+    The samples live in fixed size arrays used as a ring buffer, and the sums of
+    the regression are updated as samples come and go, so adding a sample and
+    reading the slope are O(1) and the memory used does not grow.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialise."""
+        self.size = size
+        self.times = array("d", bytes(8 * size))
+        self.values = array("d", bytes(8 * size))
+        self.count = 0
+        self.next = 0
+        # Bumped on every sample so readers know when to recompute.
+        self.version = 0
+        # Times are stored relative to origin to keep the sums small.
+        self.origin: float | None = None
+        self._sum_t = 0.0
+        self._sum_v = 0.0
+        self._sum_tt = 0.0
+        self._sum_tv = 0.0
+
+    @property
+    def last_time(self) -> float | None:
+        """Return the time of the newest sample."""
+        if self.count == 0:
+            return None
+        return self.times[(self.next - 1) % self.size] + self.origin
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample, dropping the oldest one when the buffer is full."""
+        if self.origin is None:
+            self.origin = timestamp
+        if self.count == self.size:
+            self._account(self.times[self.next], self.values[self.next], -1)
+        else:
+            self.count += 1
+        t = timestamp - self.origin
+        self.times[self.next] = t
+        self.values[self.next] = value
+        self._account(t, value, 1)
+        self.next = (self.next + 1) % self.size
+        self.version += 1
+        if self.next == 0:
+            # Once per lap, rebase the times on the oldest sample and recompute
+            # the sums so rounding errors do not pile up.
+            self._rebase()
+
+    def slope(self) -> float | None:
+        """Return the fitted change of the value per second."""
+        if self.count < 2:
+            return None
+        denominator = self.count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (self.count * self._sum_tv - self._sum_t * self._sum_v) / denominator
+
+    def _account(self, t: float, value: float, sign: int) -> None:
+        """Add or remove a sample from the regression sums."""
+        self._sum_t += sign * t
+        self._sum_v += sign * value
+        self._sum_tt += sign * t * t
+        self._sum_tv += sign * t * value
+
+    def _rebase(self) -> None:
+        """Move the origin to the oldest sample and recompute the sums."""
+        shift = min(self.times[: self.count])
+        self.origin += shift
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        for idx in range(self.count):
+            self.times[idx] -= shift
+            self._account(self.times[idx], self.values[idx], 1)
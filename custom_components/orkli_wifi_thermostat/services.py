@@ -0,0 +1,125 @@
+"""Services for the Orkli Wifi Thermostat integration."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+from datetime import datetime
+import logging
+import pstats
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    ATTR_SECONDS,
+    ATTR_TIMEOUT,
+    DEFAULT_DUMP_TIMEOUT,
+    DEFAULT_PROFILE_SECONDS,
+    DOMAIN,
+    SERVICE_DUMP_STATE,
+    SERVICE_PROFILE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=DEFAULT_PROFILE_SECONDS): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+DUMP_STATE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_DUMP_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+    }
+)
+
+_profile_lock = asyncio.Lock()
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def async_handle_profile(call: ServiceCall) -> None:
+        """Profile the event loop for the requested number of seconds."""
+        if _profile_lock.locked():
+            raise HomeAssistantError("A profile is already running")
+        async with _profile_lock:
+            await _async_profile(hass, call.data[ATTR_SECONDS])
+
+    async def async_handle_dump_state(call: ServiceCall) -> ServiceResponse:
+        """Return the register snapshot of every configured controller."""
+        runtime_data = list(hass.data[DOMAIN].values())
+        snapshots = await asyncio.gather(
+            *(
+                data.coordinator.async_dump_state(call.data[ATTR_TIMEOUT])
+                for data in runtime_data
+            )
+        )
+        return {"controllers": snapshots}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_handle_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_STATE,
+        async_handle_dump_state,
+        schema=DUMP_STATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration services once the last entry is unloaded."""
+    if hass.data.get(DOMAIN):
+        return
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+    hass.services.async_remove(DOMAIN, SERVICE_DUMP_STATE)
+
+
+async def _async_profile(hass: HomeAssistant, seconds: float) -> None:
+    """Run cProfile on the event loop thread and write the stats files.
+
+    The receive loop, the coordinator callbacks and the entity state writes all
+    run on the event loop, so they are captured without wrapping any of them;
+    nothing is hooked while no profile is running.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stats_path = hass.config.path(f"{DOMAIN}_profile_{timestamp}.prof")
+    summary_path = hass.config.path(f"{DOMAIN}_profile_{timestamp}.txt")
+
+    _LOGGER.warning("Profiling the event loop for %s seconds", seconds)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.disable()
+
+    await hass.async_add_executor_job(
+        _write_profile, profiler, stats_path, summary_path
+    )
+    _LOGGER.warning("Profile written to %s and %s", stats_path, summary_path)
+
+
+def _write_profile(profiler: cProfile.Profile, stats_path: str, summary_path: str):
+    """Dump the raw stats and a summary restricted to this integration."""
+    profiler.dump_stats(stats_path)
+    with open(summary_path, "w", encoding="utf-8") as summary:
+        stats = pstats.Stats(profiler, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(DOMAIN)
@@ -0,0 +1,122 @@
+"""Hourly long-term statistics of the Orkli zones."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .pyorkli import Device, raw_to_humidity, raw_to_temperature
+
+
+@dataclass
+class TimeWeightedValue:
+    """Time weighted mean, min and max of a value over the current hour."""
+
+    value: float | None = None
+    since: datetime | None = None
+    weighted_sum: float = 0.0
+    duration: float = 0.0
+    minimum: float | None = None
+    maximum: float | None = None
+
+    def set(self, value: float | None, now: datetime) -> None:
+        """Account for the previous value up to now and start the new one."""
+        self._integrate(now)
+        self.value = value
+        if value is None:
+            return
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def close(self, end: datetime) -> StatisticData | None:
+        """Return the statistics of the hour ending at end and start the next one."""
+        self._integrate(end)
+        statistic = (
+            StatisticData(
+                start=end - timedelta(hours=1),
+                mean=self.weighted_sum / self.duration,
+                min=self.minimum,
+                max=self.maximum,
+            )
+            if self.duration > 0
+            else None
+        )
+        self.weighted_sum = 0.0
+        self.duration = 0.0
+        self.minimum = self.maximum = self.value
+        return statistic
+
+    def _integrate(self, now: datetime) -> None:
+        """Add the current value over the time elapsed since it was set."""
+        if self.value is not None and self.since is not None:
+            seconds = (now - self.since).total_seconds()
+            self.weighted_sum += self.value * seconds
+            self.duration += seconds
+        self.since = now
+
+
+class ZoneStatistics:
+    """Hourly aggregates of a zone, imported as external statistics."""
+
+    # Statistic suffix, name suffix and unit of each aggregate.
+    KINDS = (
+        ("temperature", "temperature", UnitOfTemperature.CELSIUS),
+        ("humidity", "humidity", PERCENTAGE),
+        ("duty_cycle", "heating duty cycle", PERCENTAGE),
+    )
+
+    def __init__(self, controller_name: str) -> None:
+        """Initialise."""
+        self.controller_name = controller_name
+        self.zones: dict[int, dict[str, TimeWeightedValue]] = {}
+
+    @callback
+    def async_update(self, devices: Iterable[Device], now: datetime) -> None:
+        """Record the current values of the given devices."""
+        for device in devices:
+            values = self.zones.setdefault(
+                device.device_id, {kind: TimeWeightedValue() for kind, *_ in self.KINDS}
+            )
+            values["temperature"].set(
+                raw_to_temperature(device.current_temperature), now
+            )
+            values["humidity"].set(raw_to_humidity(device.current_humidity), now)
+            values["duty_cycle"].set(100.0 if device.on else 0.0, now)
+
+    @callback
+    def async_import(
+        self, hass: HomeAssistant, devices: Iterable[Device], end: datetime
+    ) -> None:
+        """Import the hour ending at end for every zone and start the next one."""
+        for device in devices:
+            if (values := self.zones.get(device.device_id)) is None:
+                continue
+            for kind, name, unit in self.KINDS:
+                if (statistic := values[kind].close(end)) is None:
+                    continue
+                metadata = StatisticMetaData(
+                    has_mean=True,
+                    has_sum=False,
+                    name=f"{device.name} {name}",
+                    source=DOMAIN,
+                    statistic_id=self.statistic_id(device, kind),
+                    unit_of_measurement=unit,
+                )
+                async_add_external_statistics(hass, metadata, [statistic])
+
+    @callback
+    def async_remove(self, device_id: int) -> None:
+        """Forget a zone removed from the controller."""
+        self.zones.pop(device_id, None)
+
+    def statistic_id(self, device: Device, kind: str) -> str:
+        """Return the external statistic id of a zone aggregate."""
+        return f"{DOMAIN}:{slugify(self.controller_name)}_{device.device_id}_{kind}"
@@ -0,0 +1,12 @@
+"""Test configuration.
+
+The protocol client does not depend on Home Assistant, so the tests import it
+as the top level pyorkli package from the integration directory.
+"""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(
+    0, str(Path(__file__).parents[1] / "custom_components" / "orkli_wifi_thermostat")
+)
@@ -0,0 +1,348 @@
+"""Tests of the push client: duplicate suppression, connections and receive path."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+import random
+import socket
+
+from pyorkli import (
+    FRAME_LENGTH,
+    START_BYTE,
+    FrameParser,
+    Packet,
+    PushAPI,
+    create_packet,
+)
+
+# Seconds between two frames pushed by the local controller, and seconds a
+# test waits for a frame before failing.
+PUSH_INTERVAL = 0.01
+WAIT_TIMEOUT = 2.0
+SEED = 20240601
+NOISE_BYTES = [byte for byte in range(256) if byte != START_BYTE]
+
+
+def _frame(ori: int, register: int, value: int) -> bytes:
+    """Return the frame a controller pushes for a register value."""
+    return create_packet(1, ori, 4, register, value).message
+
+
+def test_repeated_value_is_suppressed() -> None:
+    """The same value of a register within the window is dispatched once."""
+    api = PushAPI("127.0.0.1", "", "", dedup_window=60)
+    frames = [_frame(20, 4, 3), _frame(20, 4, 3)]
+    assert [api.is_duplicate(frame) for frame in frames] == [False, True]
+
+
+def test_value_going_back_is_dispatched() -> None:
+    """A register going back to a previous value is not a duplicate."""
+    api = PushAPI("127.0.0.1", "", "", dedup_window=60)
+    frames = [_frame(20, 4, 3), _frame(20, 4, 2), _frame(20, 4, 3)]
+    assert [api.is_duplicate(frame) for frame in frames] == [False, False, False]
+
+
+def test_registers_are_keyed_by_source() -> None:
+    """The same register and value from other addresses or registers is kept."""
+    api = PushAPI("127.0.0.1", "", "", dedup_window=60)
+    frames = [_frame(20, 4, 3), _frame(21, 4, 3), _frame(20, 5, 3)]
+    assert [api.is_duplicate(frame) for frame in frames] == [False, False, False]
+
+
+def test_registers_are_keyed_by_destination() -> None:
+    """The same value sent to another node does not hide the one sent to us."""
+    api = PushAPI("127.0.0.1", "", "", dedup_window=60)
+    frames = [create_packet(7, 20, 4, 3, 120).message, _frame(20, 3, 120)]
+    assert [api.is_duplicate(frame) for frame in frames] == [False, False]
+
+
+def test_dedup_disabled() -> None:
+    """A window of zero dispatches every frame."""
+    api = PushAPI("127.0.0.1", "", "", dedup_window=0)
+    frames = [_frame(20, 4, 3), _frame(20, 4, 3)]
+    assert [api.is_duplicate(frame) for frame in frames] == [False, False]
+
+
+class LocalController:
+    """Local server pushing a new current temperature frame to every client."""
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self.server: asyncio.Server | None = None
+        self.writers: set[asyncio.StreamWriter] = set()
+        self.connections = 0
+        self.port = 0
+
+    async def __aenter__(self) -> LocalController:
+        """Start listening on a free local port."""
+        self.server = await asyncio.start_server(self._push, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Stop listening and drop the clients."""
+        self.server.close()
+        self.drop_clients()
+        await self.server.wait_closed()
+
+    def drop_clients(self) -> None:
+        """Close the connection of every client."""
+        for writer in self.writers:
+            writer.close()
+
+    async def _push(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Push frames to a client until it goes away."""
+        self.connections += 1
+        self.writers.add(writer)
+        value = 1
+        try:
+            while not writer.is_closing():
+                writer.write(_frame(20, 3, value))
+                await writer.drain()
+                value = value % 250 + 1
+                await asyncio.sleep(PUSH_INTERVAL)
+        except (ConnectionError, OSError):
+            writer.close()
+        finally:
+            self.writers.discard(writer)
+
+
+def _receive_tasks() -> list[asyncio.Task]:
+    """Return the receive tasks still running."""
+    return [
+        task
+        for task in asyncio.all_tasks()
+        if not task.done() and task.get_coro().__name__ == "async_update_devices"
+    ]
+
+
+async def _wait_for_frames(received: list[Packet], count: int) -> None:
+    """Wait until count more frames are received."""
+    target = len(received) + count
+    async with asyncio.timeout(WAIT_TIMEOUT):
+        while len(received) < target:
+            await asyncio.sleep(PUSH_INTERVAL)
+
+
+def _run_connected(
+    test: Callable[[PushAPI, LocalController, list[Packet]], Awaitable[None]],
+) -> None:
+    """Run a test with a client connected to a local controller."""
+
+    async def run() -> None:
+        async with LocalController() as controller:
+            received: list[Packet] = []
+
+            async def message_callback(packet: Packet) -> None:
+                received.append(packet)
+
+            api = PushAPI(
+                "127.0.0.1",
+                "",
+                "",
+                message_callback=message_callback,
+                dedup_window=0,
+                port=controller.port,
+            )
+            await api.async_connect()
+            try:
+                await _wait_for_frames(received, 5)
+                await test(api, controller, received)
+                await _wait_for_frames(received, 5)
+                assert len(_receive_tasks()) == 1
+            finally:
+                await api.async_disconnect()
+            assert _receive_tasks() == []
+
+    asyncio.run(run())
+
+
+def test_send_after_disconnect_resumes_pushes() -> None:
+    """A command sent after a disconnection reconnects with one receive task."""
+
+    async def test(api, controller, received) -> None:
+        api.disconnect()
+        assert await api.async_send_command(create_packet(1, 255, 10, 0, 0))
+        await _wait_for_frames(received, 1)
+        assert controller.connections == 2
+
+    _run_connected(test)
+
+
+def test_send_failure_reconnects() -> None:
+    """A failed send reopens the connection and pushes keep arriving."""
+
+    async def test(api, controller, received) -> None:
+        api.socket.shutdown(socket.SHUT_WR)
+        assert not await api.async_send_command(create_packet(1, 255, 10, 0, 0))
+        assert api.connected
+        await _wait_for_frames(received, 1)
+        assert controller.connections == 2
+
+    _run_connected(test)
+
+
+def test_connection_lost_reconnects() -> None:
+    """The receive task reconnects when the controller drops the connection."""
+
+    async def test(api, controller, received) -> None:
+        controller.drop_clients()
+        async with asyncio.timeout(WAIT_TIMEOUT):
+            while controller.connections < 2:
+                await asyncio.sleep(PUSH_INTERVAL)
+
+    _run_connected(test)
+
+
+def test_reconnect_failure_leaves_disconnected() -> None:
+    """An unreachable controller leaves the client disconnected, not stuck."""
+
+    async def run() -> None:
+        async with LocalController() as controller:
+            port = controller.port
+
+        async def message_callback(packet: Packet) -> None:
+            pass
+
+        api = PushAPI("127.0.0.1", "", "", message_callback=message_callback, port=port)
+        assert not await api.async_reconnect()
+        assert not api.connected
+        assert _receive_tasks() == []
+
+    asyncio.run(run())
+
+
+async def _receive_stream(
+    chunks: list[bytes], expected: int, passive: bool = False, **kwargs
+) -> tuple[list[Packet], list[Packet], PushAPI]:
+    """Send chunks from a local server and return the frames a client dispatched.
+
+    Waits until the expected number of frames is dispatched, or the timeout.
+    """
+
+    async def send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.get_extra_info("socket").setsockopt(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+        )
+        for chunk in chunks:
+            writer.write(chunk)
+            await writer.drain()
+            # Let the client read, so the chunks arrive apart.
+            await asyncio.sleep(0)
+        # Keep the connection open, a reconnection would hide lost frames.
+        await reader.read()
+        writer.close()
+
+    received: list[Packet] = []
+    received_passive: list[Packet] = []
+
+    async def message_callback(packet: Packet) -> None:
+        received.append(packet)
+
+    async def passive_callback(packet: Packet) -> None:
+        received_passive.append(packet)
+
+    server = await asyncio.start_server(send, "127.0.0.1", 0)
+    api = PushAPI(
+        "127.0.0.1",
+        "",
+        "",
+        message_callback=message_callback,
+        passive_callback=passive_callback if passive else None,
+        port=server.sockets[0].getsockname()[1],
+        **kwargs,
+    )
+    await api.async_connect()
+    try:
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(WAIT_TIMEOUT):
+                while len(received) + len(received_passive) < expected:
+                    await asyncio.sleep(PUSH_INTERVAL)
+        # Give a wrong extra frame the chance to show up.
+        await asyncio.sleep(PUSH_INTERVAL)
+    finally:
+        await api.async_disconnect()
+        server.close()
+        await server.wait_closed()
+    assert _receive_tasks() == []
+    return received, received_passive, api
+
+
+def test_frame_for_other_node_does_not_hide_ours() -> None:
+    """A dropped frame to another node is not remembered by the dedup."""
+    frames = [create_packet(7, 20, 4, 3, 120).message, _frame(20, 3, 120)]
+    received, _, api = asyncio.run(_receive_stream(frames, 1, dedup_window=60))
+    assert [packet.message for packet in received] == frames[1:]
+    assert (api.frames_dispatched, api.frames_suppressed) == (1, 0)
+
+
+def test_repeated_frame_is_suppressed_once_dispatched() -> None:
+    """Repeats of a dispatched frame are suppressed and counted."""
+    frames = [_frame(20, 3, 120)] * 3
+    received, _, api = asyncio.run(_receive_stream(frames, 1, dedup_window=60))
+    assert [packet.message for packet in received] == frames[:1]
+    assert (api.frames_dispatched, api.frames_suppressed) == (1, 2)
+
+
+def _fuzz_stream(rng: random.Random, valid: bool) -> tuple[bytes, list[bytes]]:
+    """Return a random stream and the frames a client must dispatch from it.
+
+    A valid stream is made of frames to us and to other nodes with noise in
+    between, otherwise the bytes are arbitrary, with frequent start bytes.
+    """
+    if valid:
+        frames = [
+            create_packet(
+                rng.choice((1, rng.randrange(256))),
+                rng.randrange(256),
+                rng.randrange(256),
+                rng.randrange(256),
+                rng.randrange(256),
+            ).message
+            for _ in range(rng.randrange(1, 200))
+        ]
+        noise = [bytes(rng.choices(NOISE_BYTES, k=rng.randrange(4))) for _ in frames]
+        return b"".join(n + frame for n, frame in zip(noise, frames)), frames
+    stream = bytes(rng.randrange(256) for _ in range(rng.randrange(2048)))
+    stream = stream.replace(bytes([rng.randrange(256)]), bytes([START_BYTE]))
+    return stream, FrameParser().feed(stream)
+
+
+def _fragment(rng: random.Random, stream: bytes) -> list[bytes]:
+    """Cut a stream in chunks of random length."""
+    chunks = []
+    pos = 0
+    while pos < len(stream):
+        size = rng.randrange(1, FRAME_LENGTH * 3)
+        chunks.append(stream[pos : pos + size])
+        pos += size
+    return chunks
+
+
+def test_receive_path_fuzz() -> None:
+    """Every frame of fragmented random streams reaches the right callback."""
+    rng = random.Random(SEED)
+
+    async def run() -> None:
+        for iteration in range(40):
+            stream, frames = _fuzz_stream(rng, valid=iteration % 2 == 0)
+            passive = iteration % 4 < 2
+            to_us = [frame for frame in frames if frame[1] == 1]
+            to_others = [frame for frame in frames if frame[1] != 1] if passive else []
+            received, received_passive, api = await _receive_stream(
+                _fragment(rng, stream),
+                len(to_us) + len(to_others),
+                passive=passive,
+                dedup_window=0,
+            )
+            assert [packet.message for packet in received] == to_us
+            assert [packet.message for packet in received_passive] == to_others
+            assert api.frames_dispatched == len(to_us) + len(to_others)
+            assert api.frames_suppressed == 0
+            assert len(api.parser.buffer) < FRAME_LENGTH
+
+    asyncio.run(run())
@@ -0,0 +1,157 @@
+"""Fuzz and throughput tests of the frame codec on the receive path."""
+
+from __future__ import annotations
+
+import random
+import time
+
+from pyorkli import (
+    FRAME_LENGTH,
+    START_BYTE,
+    FrameParser,
+    Packet,
+    create_packet,
+    is_valid_message,
+)
+
+SEED = 20240601
+# Minimum throughput on a plain CI runner, well below what a laptop reaches.
+MIN_PARSED_FRAMES_PER_SECOND = 50_000
+MIN_VALIDATED_FRAMES_PER_SECOND = 200_000
+RECEIVE_BUFFER_SIZE = 4096
+NOISE_BYTES = [byte for byte in range(256) if byte != START_BYTE]
+
+
+def _random_frames(rng: random.Random, count: int) -> list[bytes]:
+    """Return valid frames with random addresses, registers and values."""
+    return [
+        create_packet(
+            rng.randrange(256),
+            rng.randrange(256),
+            rng.randrange(256),
+            rng.randrange(256),
+            rng.randrange(256),
+        ).message
+        for _ in range(count)
+    ]
+
+
+def _noise(rng: random.Random, length: int) -> bytes:
+    """Return random bytes that never contain the start byte."""
+    return bytes(rng.choice(NOISE_BYTES) for _ in range(length))
+
+
+def _fragment(rng: random.Random, stream: bytes) -> list[bytes]:
+    """Cut a stream in chunks of random length, empty ones included."""
+    chunks = []
+    pos = 0
+    while pos < len(stream):
+        size = rng.randrange(FRAME_LENGTH * 3)
+        chunks.append(stream[pos : pos + size])
+        pos += size
+    return chunks
+
+
+def _parse(chunks: list[bytes]) -> tuple[list[bytes], FrameParser]:
+    """Feed every chunk to a new parser and return the frames it found."""
+    parser = FrameParser()
+    frames = []
+    for chunk in chunks:
+        frames += parser.feed(chunk)
+        assert len(parser.buffer) < FRAME_LENGTH
+    return frames, parser
+
+
+def test_is_valid_message() -> None:
+    """Frames are checked for length, start byte and checksum."""
+    frame = create_packet(1, 20, 4, 43, 120).message
+    assert is_valid_message(frame)
+    assert not is_valid_message(frame[:-1])
+    assert not is_valid_message(frame + b"\x00")
+    assert not is_valid_message(b"\x3a" + frame[1:])
+    assert not is_valid_message(frame[:-1] + bytes([(frame[-1] + 1) & 0xFF]))
+    assert not is_valid_message(b"")
+
+
+def test_packet_fields() -> None:
+    """A packet exposes the fields of its frame."""
+    packet = Packet(create_packet(1, 20, 4, 43, 120).message)
+    assert (packet.dst, packet.ori, packet.cmd, packet.data1, packet.data2) == (
+        1,
+        20,
+        4,
+        43,
+        120,
+    )
+
+
+def test_fragmented_frames_are_not_lost() -> None:
+    """Valid frames cut anywhere and mixed with noise are all found, in order."""
+    rng = random.Random(SEED)
+    for _ in range(200):
+        frames = _random_frames(rng, rng.randrange(1, 50))
+        stream = b"".join(_noise(rng, rng.randrange(4)) + frame for frame in frames)
+        found, parser = _parse(_fragment(rng, stream))
+        assert found == frames
+        assert len(parser.buffer) == 0
+
+
+def test_arbitrary_bytes() -> None:
+    """Random streams only yield valid frames, whatever the fragmentation."""
+    rng = random.Random(SEED)
+    for _ in range(200):
+        stream = bytes(rng.randrange(256) for _ in range(rng.randrange(512)))
+        # Start bytes are frequent enough to exercise the resynchronisation.
+        stream = stream.replace(bytes([rng.randrange(256)]), bytes([START_BYTE]))
+        whole, _ = _parse([stream])
+        found, parser = _parse(_fragment(rng, stream))
+        assert found == whole
+        assert all(is_valid_message(frame) for frame in found)
+        # Every byte is part of a frame, discarded or still buffered.
+        parsed = len(found) * FRAME_LENGTH + parser.discarded_bytes
+        assert parsed + len(parser.buffer) == len(stream)
+
+
+def test_buffer_is_bounded() -> None:
+    """An endless stream without frames never grows the buffer."""
+    parser = FrameParser()
+    for _ in range(1000):
+        assert parser.feed(bytes([START_BYTE]) * 100) == []
+        assert len(parser.buffer) < FRAME_LENGTH
+
+
+def test_reset_drops_incomplete_frame() -> None:
+    """A frame cut by a reconnection is dropped, the next one is found."""
+    frame = create_packet(1, 20, 4, 43, 120).message
+    parser = FrameParser()
+    assert parser.feed(frame[:4]) == []
+    parser.reset()
+    assert parser.feed(frame) == [frame]
+
+
+def test_parser_throughput() -> None:
+    """The parser keeps up with a busy controller."""
+    rng = random.Random(SEED)
+    frames = _random_frames(rng, 100_000)
+    stream = b"".join(frames)
+    chunks = [
+        stream[pos : pos + RECEIVE_BUFFER_SIZE]
+        for pos in range(0, len(stream), RECEIVE_BUFFER_SIZE)
+    ]
+    parser = FrameParser()
+    start = time.perf_counter()
+    count = sum(len(parser.feed(chunk)) for chunk in chunks)
+    elapsed = time.perf_counter() - start
+    assert count == len(frames)
+    assert count / elapsed >= MIN_PARSED_FRAMES_PER_SECOND, count / elapsed
+
+
+def test_is_valid_message_throughput() -> None:
+    """Frame validation is cheap."""
+    rng = random.Random(SEED)
+    frames = _random_frames(rng, 100_000)
+    start = time.perf_counter()
+    count = sum(1 for frame in frames if is_valid_message(frame))
+    elapsed = time.perf_counter() - start
+    assert count == len(frames)
+    assert count / elapsed >= MIN_VALIDATED_FRAMES_PER_SECOND, count / elapsed
@@ -0,0 +1,65 @@
+"""Import-time benchmark of the standalone pyorkli package."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+
+PACKAGE_DIR = Path(__file__).parents[1] / "custom_components" / "orkli_wifi_thermostat"
+
+# Budgets in microseconds: the package with the standard library modules it
+# pulls in (asyncio mostly), and the pyorkli modules themselves.
+MAX_CUMULATIVE_IMPORT_TIME = 500_000
+MAX_OWN_IMPORT_TIME = 20_000
+
+CHECK_MODULES = """
+import sys
+import pyorkli
+loaded = [name for name in ("ftplib", "homeassistant") if name in sys.modules]
+assert not loaded, loaded
+# The integration directory is on sys.path, standard modules must still load.
+import statistics
+assert statistics.mean([1, 2]) == 1.5
+"""
+
+
+def _import_times() -> dict[str, tuple[int, int]]:
+    """Import pyorkli in a new interpreter and return its import times by module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHECK_MODULES],
+        cwd=PACKAGE_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def test_import_time() -> None:
+    """Importing pyorkli is fast and loads neither ftplib nor Home Assistant."""
+    times = _import_times()
+    cumulative = times["pyorkli"][1]
+    own = sum(
+        own_time
+        for name, (own_time, _) in times.items()
+        if name == "pyorkli" or name.startswith("pyorkli.")
+    )
+    assert cumulative <= MAX_CUMULATIVE_IMPORT_TIME, times
+    assert own <= MAX_OWN_IMPORT_TIME, times
+
+
+def test_no_standard_module_is_shadowed() -> None:
+    """No integration module hides a standard module when used standalone."""
+    modules = {path.stem for path in PACKAGE_DIR.glob("*.py")} | {
+        path.parent.name for path in PACKAGE_DIR.glob("*/__init__.py")
+    }
+    assert not modules & sys.stdlib_module_names
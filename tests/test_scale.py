@@ -0,0 +1,172 @@
+"""Scale-out harness: many simulated controllers pushing to one event loop.
+
+The simulated controllers run in a child process, each one listening on its own
+local port and pushing every register of every zone with a new value on each
+round. The test process connects one PushAPI per controller and applies the
+frames to an Installation, the per frame code the coordinator runs, then
+checks the event loop lag, the CPU used per frame and the memory used per zone
+against their budgets. Memory is traced in a run of its own, as tracing slows
+down everything else. Notifying the Home Assistant entities and recording the
+statistics are left out, they need a running Home Assistant.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+import tracemalloc
+
+from pyorkli import Installation, Packet, PushAPI, zone_registers
+from pyorkli.codec import create_packet
+from pyorkli.models import new_device
+
+# Scaling target.
+CONTROLLERS = 50
+ZONES = 32
+# Push rounds per second of every simulated controller, and test duration.
+ROUNDS_PER_SECOND = 2
+DURATION = 4.0
+
+# Budgets.
+MAX_LOOP_LAG = 0.25
+MAX_CPU_PER_FRAME = 50e-6
+MAX_MEMORY_PER_ZONE = 8 * 1024
+# At least this share of the pushed frames must have been dispatched.
+MIN_DELIVERY = 0.5
+
+
+def _run_controllers(count: int, zones: int, rate: float, ports) -> None:
+    """Serve count simulated controllers, reporting their ports to the queue."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        round_ = 0
+        try:
+            while True:
+                frames = bytearray()
+                for zone in range(zones):
+                    for register in zone_registers(zone).values():
+                        value = 1 + (round_ + zone) % 200
+                        frames += create_packet(1, 2, 4, register, value).message
+                writer.write(frames)
+                await writer.drain()
+                round_ += 1
+                await asyncio.sleep(1 / rate)
+        except ConnectionError:
+            pass
+
+    async def main() -> None:
+        servers = [
+            await asyncio.start_server(handle, "127.0.0.1", 0) for _ in range(count)
+        ]
+        for server in servers:
+            ports.put(server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+class Controller:
+    """Installation of one simulated controller, fed like the coordinator."""
+
+    def __init__(self, controller_name: str, zones: int) -> None:
+        """Initialise."""
+        devices = []
+        for zone in range(zones):
+            device = new_device(controller_name, 0)
+            device.device_id = zone
+            devices.append(device)
+        self.installation = Installation(devices)
+        # Zone updates the coordinator would notify its entities of.
+        self.updates = 0
+
+    async def message_callback(self, packet: Packet) -> None:
+        """Apply a pushed frame to the installation."""
+        self.updates += len(self.installation.process_packet(packet))
+
+
+async def _measure(
+    ports: list[int], duration: float, trace_memory: bool
+) -> dict[str, float]:
+    """Connect to every controller and measure the receive path."""
+    max_lag = 0.0
+    stop = asyncio.Event()
+
+    async def monitor_lag() -> None:
+        nonlocal max_lag
+        interval = 0.01
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            max_lag = max(max_lag, time.perf_counter() - start - interval)
+
+    if trace_memory:
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+    clients = []
+    for port in ports:
+        controller = Controller(f"controller_{port}", ZONES)
+        api = PushAPI(
+            "127.0.0.1",
+            "",
+            "",
+            message_callback=controller.message_callback,
+            port=port,
+        )
+        await api.async_connect()
+        clients.append((api, controller))
+
+    monitor = asyncio.create_task(monitor_lag())
+    cpu_start = time.process_time()
+    await asyncio.sleep(duration)
+    cpu = time.process_time() - cpu_start
+    stop.set()
+    await monitor
+
+    memory = 0
+    if trace_memory:
+        memory = sum(
+            stat.size_diff
+            for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename")
+            if stat.size_diff > 0
+        )
+        tracemalloc.stop()
+    frames = sum(api.frames_dispatched for api, _ in clients)
+    updates = sum(controller.updates for _, controller in clients)
+    for api, _ in clients:
+        await api.async_disconnect()
+
+    return {
+        "loop_lag": max_lag,
+        "cpu_per_frame": cpu / max(frames, 1),
+        "memory_per_zone": memory / (len(ports) * ZONES),
+        "frames": frames,
+        "updates": updates,
+    }
+
+
+def test_scale_out() -> None:
+    """Many controllers and zones stay within the lag, CPU and memory budgets."""
+    context = multiprocessing.get_context("spawn")
+    ports_queue = context.Queue()
+    simulator = context.Process(
+        target=_run_controllers,
+        args=(CONTROLLERS, ZONES, ROUNDS_PER_SECOND, ports_queue),
+        daemon=True,
+    )
+    simulator.start()
+    try:
+        ports = [ports_queue.get(timeout=30) for _ in range(CONTROLLERS)]
+        result = asyncio.run(_measure(ports, DURATION, trace_memory=False))
+        memory = asyncio.run(_measure(ports, 1.0, trace_memory=True))
+    finally:
+        simulator.terminate()
+        simulator.join()
+
+    pushed = CONTROLLERS * ZONES * 5 * ROUNDS_PER_SECOND * DURATION
+    assert result["frames"] >= pushed * MIN_DELIVERY, result
+    # Every round changes the registers of every zone.
+    assert result["updates"] >= result["frames"] * MIN_DELIVERY, result
+    assert result["loop_lag"] <= MAX_LOOP_LAG, result
+    assert result["cpu_per_frame"] <= MAX_CPU_PER_FRAME, result
+    assert memory["memory_per_zone"] <= MAX_MEMORY_PER_ZONE, memory